@@ -2,16 +2,21 @@
 Tools to compute Partial Dependency
 ===================================
 """
-import copy
-import itertools
-
+import joblib
 import numpy
 import pandas
+from sklearn.inspection import partial_dependence as sklearn_partial_dependence
 
 from orion.analysis.base import flatten_numpy, flatten_params, to_numpy, train_regressor
 from orion.core.utils import format_trials
 from orion.core.worker.transformer import build_required_space
 
+# Maximum number of values (rows x features) passed to a single ``model.predict`` call
+MAX_BATCH_SIZE = 2**22
+
+# Regressors supporting the tree traversal of ``method="recursion"``
+RECURSION_REGRESSORS = ("RandomForestRegressor",)
+
 
 def partial_dependency(
     trials,
@@ -20,7 +25,9 @@ def partial_dependency(
     model="RandomForestRegressor",
     n_grid_points=10,
     n_samples=50,
-    **kwargs
+    method="brute",
+    n_workers=1,
+    **kwargs,
 ):
     """
     Calculates the partial dependency of parameters in a collection of
@@ -53,6 +60,18 @@ def partial_dependency(
         Number of samples to randomly generate the grid used to compute the partial dependency.
         Default is 50.
 
+    method: str
+        Method used to compute the partial dependency. Can be one of
+        - brute (Default): Average the predictions of the model over ``n_samples`` random
+          samples for each point of the grid.
+        - recursion: Traverse the trees of the model to average over the trials used for
+          training. Much faster, but only supported for RandomForestRegressor.
+          The standard deviations are not available with this method and are set to 0.
+
+    n_workers: int
+        Number of threads used to compute the grids of the parameters and pairs of
+        parameters in parallel. -1 uses all CPUs. Default is 1.
+
     **kwargs
         Arguments for the regressor model.
 
@@ -64,6 +83,17 @@ def partial_dependency(
         (dim1.name, dim2.name, objective) or (dim1.name, objective).
 
     """
+    if method not in ("brute", "recursion"):
+        raise ValueError(
+            f"{method} is not a supported method. Must be one of: brute, recursion"
+        )
+
+    if method == "recursion" and model not in RECURSION_REGRESSORS:
+        raise ValueError(
+            f"Method recursion is not supported for {model}. "
+            f"Must be one of: {', '.join(RECURSION_REGRESSORS)}"
+        )
+
     params = flatten_params(space, params)
 
     flattened_space = build_required_space(
@@ -80,37 +110,63 @@ def partial_dependency(
     data = flatten_numpy(data, flattened_space)
     model = train_regressor(model, data, **kwargs)
 
-    data = [
-        format_trials.trial_to_tuple(trial, flattened_space)
-        for trial in flattened_space.sample(n_samples)
-    ]
-    data = pandas.DataFrame(data, columns=flattened_space.keys())
+    if method == "recursion":
 
-    partial_dependencies = dict()
+        def compute_grid(grid_params):
+            return partial_dependency_recursion_grid(
+                flattened_space, model, grid_params, n_grid_points
+            )
+
+    else:
+        data = [
+            format_trials.trial_to_tuple(trial, flattened_space)
+            for trial in flattened_space.sample(n_samples)
+        ]
+        data = pandas.DataFrame(data, columns=flattened_space.keys())
+
+        def compute_grid(grid_params):
+            return partial_dependency_grid(
+                flattened_space, model, grid_params, data, n_grid_points
+            )
+
+    keys = []
     for x_i, x_name in enumerate(params):
-        grid, averages, stds = partial_dependency_grid(
-            flattened_space, model, [x_name], data, n_grid_points
-        )
-        grid = reverse(flattened_space, grid)
-        partial_dependencies[x_name] = (grid, averages, stds)
+        keys.append(x_name)
         for y_i in range(x_i + 1, len(params)):
-            y_name = params[y_i]
-            grid, averages, stds = partial_dependency_grid(
-                flattened_space, model, [x_name, y_name], data, n_grid_points
-            )
-            grid = reverse(flattened_space, grid)
-            partial_dependencies[(x_name, y_name)] = (grid, averages, stds)
+            keys.append((x_name, params[y_i]))
+
+    # Threads avoid pickling the space, and predictions of tree models release the GIL.
+    results = joblib.Parallel(n_jobs=n_workers, prefer="threads")(
+        joblib.delayed(compute_grid)([key] if isinstance(key, str) else list(key))
+        for key in keys
+    )
+
+    reverse_cache = {}
+    partial_dependencies = dict()
+    for key, (grid, averages, stds) in zip(keys, results):
+        grid = reverse(flattened_space, grid, reverse_cache)
+        partial_dependencies[key] = (grid, averages, stds)
 
     return partial_dependencies
 
 
-def reverse(transformed_space, grid):
-    """Reverse transformations on the grid to bring back to original space"""
+def reverse(transformed_space, grid, cache=None):
+    """Reverse transformations on the grid to bring back to original space
+
+    If a dict is given as ``cache``, reversed values are memoized in it so that grids
+    sharing the same params are only reversed once.
+    """
+    if cache is None:
+        cache = {}
+
     for param in grid.keys():
         transformed_dim = transformed_space[param].original_dimension
         param_grid = []
         for value in grid[param]:
-            param_grid.append(transformed_dim.reverse(value))
+            key = (param, value)
+            if key not in cache:
+                cache[key] = transformed_dim.reverse(value)
+            param_grid.append(cache[key])
         grid[param] = param_grid
     return grid
 
@@ -125,28 +181,70 @@ def make_grid(dim, n_points):
 
 
 def partial_dependency_grid(space, model, params, samples, n_points=40):
-    """Compute the dependency grid for a given set of params (1 or 2)"""
+    """Compute the dependency grid for a given set of params (1 or 2)
 
-    samples = copy.deepcopy(samples)
+    The samples of all grid cells are stacked and predicted in batches of at most
+    ``MAX_BATCH_SIZE`` values instead of calling ``model.predict`` once per cell.
+    """
 
     grids = {}
     for name in params:
         grids[name] = make_grid(space[name], n_points)
 
     lengths = [len(grids[name]) for name in params]
-    averages = numpy.zeros(lengths)
-    stds = numpy.zeros(lengths)
+    n_cells = int(numpy.prod(lengths))
 
-    indexed_combinations = zip(
-        itertools.product(*(list(range(length)) for length in lengths)),
-        itertools.product(*grids.values()),
-    )
-    for z_idx, combination in indexed_combinations:
-        for i, name in enumerate(params):
-            samples[name] = combination[i]
+    samples_arr = samples.to_numpy(dtype=numpy.float64)
+    n_samples = samples_arr.shape[0]
+    columns = [samples.columns.get_loc(name) for name in params]
+    # Grid indices of each cell, in the same order as itertools.product
+    cell_indices = numpy.indices(lengths).reshape(len(params), -1)
+
+    cells_per_batch = min(n_cells, max(1, MAX_BATCH_SIZE // max(1, samples_arr.size)))
+    # Only the columns of params differ between batches, the buffer is reused as is.
+    buffer = numpy.tile(samples_arr, (cells_per_batch, 1))
+    predictions = numpy.empty((n_cells, n_samples))
+    for start in range(0, n_cells, cells_per_batch):
+        stop = min(start + cells_per_batch, n_cells)
+        batch = buffer[: (stop - start) * n_samples]
+        for column, name, indices in zip(columns, params, cell_indices):
+            batch[:, column] = numpy.repeat(grids[name][indices[start:stop]], n_samples)
+
+        predictions[start:stop] = model.predict(batch).reshape(stop - start, n_samples)
 
-        predictions = model.predict(samples.to_numpy())
-        averages[z_idx] = numpy.mean(predictions)
-        stds[z_idx] = numpy.std(predictions)
+    averages = predictions.mean(axis=1).reshape(lengths)
+    stds = predictions.std(axis=1).reshape(lengths)
 
     return grids, averages.T, stds.T
+
+
+def partial_dependency_recursion_grid(space, model, params, n_points=40):
+    """Compute the dependency grid for a given set of params (1 or 2) by tree traversal
+
+    The partial dependency is averaged over the data used to train the tree-based ``model``
+    instead of random samples, hence there are no standard deviations and they are set to 0.
+    """
+
+    grids = {}
+    for name in params:
+        grids[name] = make_grid(space[name], n_points)
+
+    features = [list(space.keys()).index(name) for name in params]
+
+    # Scikit-learn builds its grid with the unique values of the data when there are fewer
+    # of them than ``grid_resolution``. Feed it our grids so that they are used as is.
+    n_rows = max(len(grid) for grid in grids.values())
+    values = numpy.zeros((n_rows, len(space)))
+    for feature, name in zip(features, params):
+        values[:, feature] = numpy.resize(grids[name], n_rows)
+
+    averages = sklearn_partial_dependence(
+        model,
+        values,
+        features,
+        grid_resolution=n_rows + 1,
+        method="recursion",
+        kind="average",
+    )["average"][0]
+
+    return grids, averages.T, numpy.zeros(averages.T.shape)
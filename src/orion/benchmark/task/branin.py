@@ -4,13 +4,18 @@
 Task for Branin Function
 =========================
 """
-import copy
 import math
 
-import numpy
-
 from orion.benchmark.task.base import BenchmarkTask
 
+# Constants of the Branin function, ``a`` being 1.
+_B = 5.1 / (4 * math.pi * math.pi)
+_C = 5 / math.pi
+_R = 6
+_S = 10
+_T = 1 / (8 * math.pi)
+_S_1MT = _S * (1 - _T)
+
 
 class Branin(BenchmarkTask):
     """`Branin function <http://infinity77.net/global_optimization/test_functions_nd_B.html#go_benchmark.Branin01>`_
@@ -22,21 +27,12 @@ class Branin(BenchmarkTask):
 
     def call(self, x):
         """Evaluate a 2-D branin function."""
-        x = copy.deepcopy(x)
-        x[0] = (x[0] * 15) - 5
-        x[1] = x[1] * 15
-
-        a = 1
-        b = 5.1 / (4 * numpy.square(math.pi))
-        c = 5 / math.pi
-        r = 6
-        t = 1 / (8 * math.pi)
-        s = 10
-        y = (
-            a * numpy.square(x[1] - b * numpy.square(x[0]) + c * x[0] - r)
-            + s * (1 - t) * numpy.cos(x[0])
-            + s
-        )
+        # Python floats avoid the overhead of NumPy scalars when x is an array.
+        x0 = float(x[0]) * 15 - 5
+        x1 = float(x[1]) * 15
+
+        u = x1 - _B * x0 * x0 + _C * x0 - _R
+        y = u * u + _S_1MT * math.cos(x0) + _S
 
         return [dict(name="branin", type="objective", value=y)]
 
@@ -8,6 +8,9 @@ import numpy
 
 from orion.benchmark.task.base import BenchmarkTask
 
+# Dimension up to which a Python loop is faster than NumPy calls
+MAX_SCALAR_DIM = 32
+
 
 class RosenBrock(BenchmarkTask):
     """`RosenBrock function <http://infinity77.net/global_optimization/test_functions_nd_R.html#go_benchmark.Rosenbrock>`_
@@ -19,9 +22,22 @@ class RosenBrock(BenchmarkTask):
 
     def call(self, x):
         """Evaluate a n-D rosenbrock function."""
-        x = numpy.asarray(x)
-        summands = 100 * (x[1:] - x[:-1] ** 2) ** 2 + (1 - x[:-1]) ** 2
-        y = numpy.sum(summands)
+        if len(x) <= MAX_SCALAR_DIM:
+            # Python floats avoid the overhead of NumPy calls on small inputs.
+            x = x.tolist() if isinstance(x, numpy.ndarray) else x
+            y = 0.0
+            for x_i, x_next in zip(x[:-1], x[1:]):
+                d = x_next - x_i * x_i
+                e = 1.0 - x_i
+                y += 100.0 * d * d + e * e
+        else:
+            if not isinstance(x, numpy.ndarray) or x.dtype != numpy.float64:
+                x = numpy.asarray(x, dtype=numpy.float64)
+            head = x[:-1]
+            d = x[1:] - head * head
+            e = 1.0 - head
+            # Dot products fuse the squaring and the summation of each term.
+            y = 100.0 * numpy.dot(d, d) + numpy.dot(e, e)
         return [dict(name="rosenbrock", type="objective", value=y)]
 
     def get_search_space(self):
@@ -18,6 +18,7 @@ from orion.analysis.partial_dependency_utils import (
     make_grid,
     partial_dependency,
     partial_dependency_grid,
+    partial_dependency_recursion_grid,
     reverse,
 )
 from orion.core.io.space_builder import SpaceBuilder
@@ -146,6 +147,21 @@ def test_reverse_with_reshape(hspace):
     assert reversed_grid["z"] == ["a", "a", "b", "c"]
 
 
+def test_reverse_cache(space):
+    """Test that reversed values are memoized in the given cache"""
+    flattened_space = flatten_space(space)
+
+    cache = {}
+    reversed_grid = reverse(flattened_space, {"z": [0, 0, 1, 2]}, cache)
+    assert reversed_grid["z"] == ["a", "a", "b", "c"]
+    assert cache == {("z", 0): "a", ("z", 1): "b", ("z", 2): "c"}
+
+    cache[("z", 1)] = "cached"
+    reversed_grid = reverse(flattened_space, {"x": [0, 1], "z": [1, 2]}, cache)
+    assert reversed_grid["x"] == [0, 1]
+    assert reversed_grid["z"] == ["cached", "c"]
+
+
 def test_make_grid(hspace):
     """Test that different dimension types are supported"""
     flattened_space = flatten_space(hspace)
@@ -242,6 +258,84 @@ def test_partial_dependency_grid(hspace):
     assert stds[2, 4] == numpy.arange(n_samples).std()
 
 
+def test_partial_dependency_grid_batches(monkeypatch, hspace):
+    """Test that splitting predictions in small batches gives the same results"""
+
+    flattened_space = flatten_space(hspace)
+
+    samples = [
+        format_trials.trial_to_tuple(trial, flattened_space)
+        for trial in flattened_space.sample(20)
+    ]
+    samples = pd.DataFrame(samples, columns=flattened_space.keys())
+
+    model = RandomForestRegressor(n_estimators=5, random_state=1)
+    model.fit(samples.to_numpy(), numpy.arange(samples.shape[0]))
+
+    grid, averages, stds = partial_dependency_grid(
+        flattened_space, model, ["x", "z"], samples, n_points=5
+    )
+
+    n_calls = 0
+    predict = model.predict
+
+    def counting_predict(data):
+        nonlocal n_calls
+        n_calls += 1
+        return predict(data)
+
+    monkeypatch.setattr(model, "predict", counting_predict)
+    monkeypatch.setattr(
+        "orion.analysis.partial_dependency_utils.MAX_BATCH_SIZE", samples.size * 2
+    )
+
+    batched_grid, batched_averages, batched_stds = partial_dependency_grid(
+        flattened_space, model, ["x", "z"], samples, n_points=5
+    )
+
+    assert n_calls == 8
+    assert list(batched_grid["x"]) == list(grid["x"])
+    numpy.testing.assert_allclose(batched_averages, averages)
+    numpy.testing.assert_allclose(batched_stds, stds)
+
+
+def test_partial_dependency_recursion_grid(hspace):
+    """Test that tree traversal matches brute force when only params are split"""
+
+    flattened_space = flatten_space(hspace)
+
+    samples = [
+        format_trials.trial_to_tuple(trial, flattened_space)
+        for trial in flattened_space.sample(50)
+    ]
+    samples = pd.DataFrame(samples, columns=flattened_space.keys())
+
+    # With constant values for other features, trees can only split on params and
+    # both methods have nothing to marginalize, so they must be equal.
+    for params in (["x"], ["x", "z"]):
+        train = samples.copy()
+        for name in train.columns.difference(params):
+            train[name] = train[name].iloc[0]
+        objectives = train[params].sum(axis=1)
+
+        model = RandomForestRegressor(n_estimators=5, bootstrap=False, random_state=1)
+        model.fit(train.to_numpy(), objectives.to_numpy())
+
+        grid, averages, stds = partial_dependency_recursion_grid(
+            flattened_space, model, params, n_points=5
+        )
+        brute_grid, brute_averages, _ = partial_dependency_grid(
+            flattened_space, model, params, train, n_points=5
+        )
+
+        assert list(grid.keys()) == params
+        for name in params:
+            assert list(grid[name]) == list(brute_grid[name])
+        assert averages.shape == brute_averages.shape
+        numpy.testing.assert_allclose(averages, brute_averages)
+        assert (stds == 0).all()
+
+
 def test_accept_empty(space):
     """Tests an empty dataframe is returned if you give an empty dataframe"""
     empty_frame = pd.DataFrame()
@@ -336,6 +430,54 @@ def test_categorical(monkeypatch, space):
     assert partial_dependencies["z"][2].shape == (3,)
 
 
+def test_method(space):
+    """Test computing with tree traversal instead of random samples"""
+    partial_dependencies = partial_dependency(
+        data, space, params=["x", "z"], method="recursion", random_state=1
+    )
+
+    assert set(partial_dependencies.keys()) == {"x", ("x", "z"), "z"}
+    assert partial_dependencies["z"][0]["z"] == ["a", "b", "c"]
+    assert partial_dependencies["x"][1].shape == (10,)
+    assert partial_dependencies[("x", "z")][1].shape == (3, 10)
+    assert (partial_dependencies[("x", "z")][2] == 0).all()
+
+
+def test_bad_method(space):
+    """Test that unsupported methods or models are rejected"""
+    with pytest.raises(ValueError, match="bad is not a supported method"):
+        partial_dependency(data, space, method="bad")
+
+    with pytest.raises(ValueError, match="not supported for AdaBoostRegressor"):
+        partial_dependency(data, space, model="AdaBoostRegressor", method="recursion")
+
+
+def test_n_workers(space):
+    """Test that computing grids in parallel gives the same results"""
+    partial_dependencies = partial_dependency(
+        data, space, params=["x", "y", "z"], method="recursion", random_state=1
+    )
+    parallel_partial_dependencies = partial_dependency(
+        data,
+        space,
+        params=["x", "y", "z"],
+        method="recursion",
+        n_workers=2,
+        random_state=1,
+    )
+
+    assert list(parallel_partial_dependencies.keys()) == list(
+        partial_dependencies.keys()
+    )
+    for key, (grid, averages, stds) in partial_dependencies.items():
+        parallel_grid, parallel_averages, parallel_stds = parallel_partial_dependencies[
+            key
+        ]
+        assert parallel_grid == grid
+        numpy.testing.assert_allclose(parallel_averages, averages)
+        numpy.testing.assert_allclose(parallel_stds, stds)
+
+
 def test_n_grid_points(monkeypatch, space):
     """Test that number of points on grid is correct, including adjustment for categorical dims"""
     mock_train_regressor(monkeypatch)
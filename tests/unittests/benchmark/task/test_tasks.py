@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """Tests for :mod:`orion.benchmark.task`."""
+import math
+
+import numpy
+import pytest
 
 from orion.benchmark.task import Branin, CarromTable, EggHolder, RosenBrock
 
@@ -23,6 +27,13 @@ class TestBranin:
         objectives = task([1, 2])
         assert type(objectives[0]) == dict
 
+    def test_call_minimum(self):
+        """Test that the known global minimum is reached"""
+        task = Branin(2)
+
+        objectives = task([(math.pi + 5) / 15, 2.275 / 15])
+        assert objectives[0]["value"] == pytest.approx(0.397887, abs=1e-6)
+
     def test_search_space(self):
         """Test to get task search space"""
         task = Branin(2)
@@ -98,6 +109,26 @@ class TestRosenBrock:
         objectives = task([1, 2])
         assert type(objectives[0]) == dict
 
+    def test_call_value(self):
+        """Test the value of the function against its closed form"""
+        task = RosenBrock(2, dim=3)
+
+        assert task([1, 1, 1])[0]["value"] == 0
+        assert task([1, 2, 3])[0]["value"] == pytest.approx(100 + 100 + 1)
+
+    def test_call_large_dim(self):
+        """Test the value of the function for small and large dims"""
+        task = RosenBrock(2, dim=100)
+
+        x = numpy.linspace(-1, 2, 100)
+        expected = sum(
+            100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(99)
+        )
+        assert task(x)[0]["value"] == pytest.approx(expected)
+        assert task(x[:10])[0]["value"] == pytest.approx(
+            sum(100 * (x[i + 1] - x[i] ** 2) ** 2 + (1 - x[i]) ** 2 for i in range(9))
+        )
+
     def test_search_space(self):
         """Test to get task search space"""
         task = RosenBrock(2)